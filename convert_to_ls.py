@@ -33,12 +33,29 @@ Notes:
 - If a model item has no coordinates, we skip spatial prefill (still possible to add task-level meta if needed).
 """
 
-import json
+import os
 import sys
-import uuid
+import math
 import argparse
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Any, Optional
+
+import numpy as np
+
+from json_io import load_json, dump_json_stream, dumps_compact
+
+try:
+    import ijson  # optional: stream Textract Blocks instead of loading the whole file
+except ImportError:
+    ijson = None
+
+try:
+    import msgspec  # optional: decode Textract straight into typed structs
+except ImportError:
+    msgspec = None
 
 # ----------------------------
 # Helpers: geometry & matching
@@ -63,6 +80,105 @@ def center_inside(child, parent) -> bool:
     cy = child[1] + child[3] / 2.0
     return (parent[0] <= cx <= parent[0] + parent[2]) and (parent[1] <= cy <= parent[1] + parent[3])
 
+def as_boxes(bboxes) -> np.ndarray:
+    """Stack (left, top, width, height) tuples into an (N,4) float array."""
+    return np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+# numba (optional) only pays off on large matrices: importing it and loading the compiled
+# kernel costs ~0.4 s, so it is imported lazily, the first time a matrix has at least this
+# many (a, b) pairs. Set to None to never use numba.
+NUMBA_MIN_PAIRS: Optional[int] = 1_000_000
+
+@lru_cache(maxsize=None)
+def _numba_iou_kernel():
+    """The compiled IoU kernel, or None if numba is not installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True, nogil=True, boundscheck=False)
+    def _iou_matrix_nb(a, b, out):
+        # Same arithmetic as iou(), one (i, j) pair at a time, without (N,M,2) temporaries
+        for i in range(a.shape[0]):
+            ax1, ay1, aw, ah = a[i, 0], a[i, 1], a[i, 2], a[i, 3]
+            ax2, ay2 = ax1 + aw, ay1 + ah
+            for j in range(b.shape[0]):
+                bx1, by1, bw, bh = b[j, 0], b[j, 1], b[j, 2], b[j, 3]
+                inter_w = max(0.0, min(ax2, bx1 + bw) - max(ax1, bx1))
+                inter_h = max(0.0, min(ay2, by1 + bh) - max(ay1, by1))
+                inter = inter_w * inter_h
+                union = aw * ah + bw * bh - inter
+                out[i, j] = inter / union if inter > 0 and union > 0 else 0.0
+
+    return _iou_matrix_nb
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise iou() between boxes a (N,4) and b (M,4) -> (N,M).
+    Boxes are (left, top, width, height), as everywhere else in this module.
+    Uses the numba kernel for matrices of NUMBA_MIN_PAIRS pairs or more (if numba is
+    installed), NumPy broadcasting otherwise.
+    """
+    if NUMBA_MIN_PAIRS is not None and a.shape[0] * b.shape[0] >= NUMBA_MIN_PAIRS:
+        kernel = _numba_iou_kernel()
+        if kernel is not None:
+            out = np.empty((a.shape[0], b.shape[0]), dtype=np.float64)
+            kernel(np.ascontiguousarray(a), np.ascontiguousarray(b), out)
+            return out
+
+    a2 = a[:, :2] + a[:, 2:]
+    b2 = b[:, :2] + b[:, 2:]
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a2[:, None, :], b2[None, :, :])
+    inter = np.prod(np.clip(br - tl, 0.0, None), axis=2)
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None, :] - inter
+    out = np.zeros_like(inter)
+    np.divide(inter, union, out=out, where=(inter > 0) & (union > 0))
+    return out
+
+def center_inside_matrix(child: np.ndarray, parent: np.ndarray) -> np.ndarray:
+    """Pairwise center_inside() for boxes child (N,4) and parent (M,4) -> (N,M) bool mask."""
+    cx = (child[:, 0] + child[:, 2] / 2.0)[:, None]
+    cy = (child[:, 1] + child[:, 3] / 2.0)[:, None]
+    px, py = parent[None, :, 0], parent[None, :, 1]
+    return ((px <= cx) & (cx <= px + parent[None, :, 2]) &
+            (py <= cy) & (cy <= py + parent[None, :, 3]))
+
+# Coarse grid over the normalized page used to prune (word, prediction) pairs before IoU
+GRID_CELLS = 10
+
+def grid_span(bbox) -> Tuple[range, range]:
+    """
+    Grid columns/rows touched by a (left, top, width, height) box, clamped to the page.
+    Boxes that overlap (or touch) always share at least one cell.
+    """
+    x, y, w, h = bbox
+    g = GRID_CELLS
+    return (range(min(max(int(x * g), 0), g), min(max(int((x + w) * g), 0), g) + 1),
+            range(min(max(int(y * g), 0), g), min(max(int((y + h) * g), 0), g) + 1))
+
+def is_finite_box(bbox) -> bool:
+    """False for boxes with a NaN/inf coordinate (or edge), which cannot be placed on the grid."""
+    x, y, w, h = bbox
+    return math.isfinite(x + w) and math.isfinite(y + h) and math.isfinite(x) and math.isfinite(y)
+
+def build_grid(bboxes) -> Dict[Optional[Tuple[int, int]], List[int]]:
+    """
+    Maps each grid cell -> indices of the boxes touching it.
+    Non-finite boxes go under the key None, to be checked against every query.
+    """
+    grid: Dict[Optional[Tuple[int, int]], List[int]] = defaultdict(list)
+    for i, bbox in enumerate(bboxes):
+        if not is_finite_box(bbox):
+            grid[None].append(i)
+            continue
+        cols, rows = grid_span(bbox)
+        for gx in cols:
+            for gy in rows:
+                grid[(gx, gy)].append(i)
+    return grid
+
 def norm_to_pct(bbox):
     # Textract normalized [0..1] -> LS wants percent [0..100]
     x, y, w, h = bbox
@@ -74,10 +190,58 @@ def norm_to_pct(bbox):
         "rotation": 0
     }
 
+def norms_to_pct(bboxes) -> List[List[float]]:
+    # Batched norm_to_pct(): one vector multiply for all boxes of a page, as [x, y, width, height] rows
+    return (as_boxes(bboxes) * 100.0).tolist()
+
+def region_ids(n: int) -> List[str]:
+    """
+    n random UUID4 strings, built from one os.urandom() call instead of n uuid.uuid4() objects.
+    Version/variant bits are set so the ids are still valid UUID4s.
+    """
+    hx = os.urandom(16 * n).hex()
+    return [
+        f"{hx[i:i + 8]}-{hx[i + 8:i + 12]}-4{hx[i + 13:i + 16]}-"
+        f"{'89ab'[int(hx[i + 16], 16) & 3]}{hx[i + 17:i + 20]}-{hx[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
 # ----------------------------
 # Textract parsing
 # ----------------------------
 
+def collect_words(entries: Iterable[Tuple[int, str, Tuple[float, float, float, float]]]
+                  ) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Groups (page, text, bbox) entries into page_number -> list of words.
+    Shared by every Textract reader, so they all build the same word dicts.
+    """
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+    setdefault = pages.setdefault
+    for page, text, bbox in entries:
+        setdefault(page, []).append({"text": text, "bbox": bbox, "page": page})
+    return pages
+
+def _block_words(blocks: Iterable[Dict[str, Any]]):
+    # Runs once per Textract block, so lookups are hoisted into locals
+    for b in blocks:
+        get = b.get
+        if get("BlockType") != "WORD":
+            continue
+        geom = get("Geometry")
+        bb = geom.get("BoundingBox") if geom else None
+        if bb is None:
+            continue
+        bb_get = bb.get
+        yield (get("Page", 1), get("Text", ""),
+               (bb_get("Left", 0.0), bb_get("Top", 0.0), bb_get("Width", 0.0), bb_get("Height", 0.0)))
+
+def words_from_blocks(blocks: Iterable[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Collects WORD blocks (from a list or a stream) into page_number -> list of words.
+    """
+    return collect_words(_block_words(blocks))
+
 def extract_words_from_textract(textract: Dict[str, Any]) -> Dict[int, List[Dict[str, Any]]]:
     """
     Returns a dict: page_number -> list of words
@@ -90,21 +254,11 @@ def extract_words_from_textract(textract: Dict[str, Any]) -> Dict[int, List[Dict
       - Full Textract JSON with Blocks
       - Reduced custom JSON with items containing "text"/"word" + coords
     """
-    pages: Dict[int, List[Dict[str, Any]]] = {}
-
     if "Blocks" in textract:
         # Full AWS Textract structure
-        for b in textract["Blocks"]:
-            if b.get("BlockType") == "WORD" and "Geometry" in b and "BoundingBox" in b["Geometry"]:
-                bb = b["Geometry"]["BoundingBox"]
-                page = b.get("Page", 1)
-                wobj = {
-                    "text": b.get("Text", ""),
-                    "bbox": (bb.get("Left", 0.0), bb.get("Top", 0.0), bb.get("Width", 0.0), bb.get("Height", 0.0)),
-                    "page": page
-                }
-                pages.setdefault(page, []).append(wobj)
-        return pages
+        return words_from_blocks(textract["Blocks"])
+
+    pages: Dict[int, List[Dict[str, Any]]] = {}
 
     # Fallback: try to infer from simplified structures
     # Expect a list of dicts with "page", "text"/"word", and normalized coords {left, top, width, height}
@@ -131,6 +285,76 @@ def extract_words_from_textract(textract: Dict[str, Any]) -> Dict[int, List[Dict
 
     raise ValueError("Unsupported Textract JSON shape. Provide full Textract with Blocks or a list of word items.")
 
+def extract_words_from_textract_stream(path) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Same as extract_words_from_textract() for full Textract JSON (with Blocks),
+    but reads the file one Block at a time with ijson, so large exports are
+    never held in memory as a whole.
+    """
+    with open(path, "rb") as f:
+        return words_from_blocks(ijson.items(f, "Blocks.item", use_float=True))
+
+if msgspec is not None:
+    # Only the Textract fields we read; msgspec skips every other key without building it
+    class _TextractBBox(msgspec.Struct):
+        Left: float = 0.0
+        Top: float = 0.0
+        Width: float = 0.0
+        Height: float = 0.0
+
+    class _TextractGeometry(msgspec.Struct):
+        BoundingBox: Optional[_TextractBBox] = None
+
+    class _TextractBlock(msgspec.Struct):
+        BlockType: str = ""
+        Text: str = ""
+        Page: int = 1
+        Geometry: Optional[_TextractGeometry] = None
+
+    class _TextractDoc(msgspec.Struct):
+        Blocks: List[_TextractBlock] = []
+
+def _struct_words(blocks):
+    for b in blocks:
+        if b.BlockType != "WORD" or b.Geometry is None:
+            continue
+        bb = b.Geometry.BoundingBox
+        if bb is None:
+            continue
+        yield (b.Page, b.Text, (bb.Left, bb.Top, bb.Width, bb.Height))
+
+def extract_words_from_textract_typed(path) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Same as extract_words_from_textract() for full Textract JSON (with Blocks),
+    decoded with msgspec into typed structs instead of per-block dicts.
+    Raises msgspec.ValidationError if the file does not fit the Textract schema.
+    """
+    doc = msgspec.json.decode(Path(path).read_bytes(), type=_TextractDoc)
+    return collect_words(_struct_words(doc.Blocks))
+
+def load_textract_words(path) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Reads a Textract JSON file into page_number -> list of words.
+    Full Textract (a top-level object with Blocks) is decoded with msgspec when installed,
+    else streamed with ijson when installed. Reduced list-shaped files, files that do not
+    fit the typed schema, or ones that yield no words go through load_json().
+    """
+    if msgspec is not None or ijson is not None:
+        with open(path, "rb") as f:
+            head = f.read(64).lstrip()
+        if head.startswith(b"{"):
+            pages = None
+            if msgspec is not None:
+                try:
+                    pages = extract_words_from_textract_typed(path)
+                except msgspec.ValidationError:
+                    pages = None
+            elif ijson is not None:
+                pages = extract_words_from_textract_stream(path)
+            if pages:
+                return pages
+    return extract_words_from_textract(load_json(path))
+
 # ----------------------------
 # Model parsing
 # ----------------------------
@@ -171,6 +395,70 @@ def union_box(boxes: List[Tuple[float, float, float, float]]) -> Optional[Tuple[
 # Alignment: model → words
 # ----------------------------
 
+def group_predictions_by_page(
+    pages_words: Dict[int, List[Dict[str, Any]]],
+    preds: List[Dict[str, Any]]
+) -> Dict[int, List[int]]:
+    """
+    Buckets prediction indices by page. Preds without coords (cannot spatially align)
+    or on pages without words are dropped here.
+    """
+    page_preds: Dict[int, List[int]] = defaultdict(list)
+    for pi, pred in enumerate(preds):
+        if pred["boxes"]:
+            page = int(pred["page"] or 1)
+            if pages_words.get(page):
+                page_preds[page].append(pi)
+    return page_preds
+
+def align_page(
+    words: List[Dict[str, Any]],
+    preds: List[Dict[str, Any]],
+    pis: List[int],
+    iou_thresh: float = 0.2
+) -> Dict[int, List[int]]:
+    """
+    Matches the predictions preds[pi] for pi in pis against one page's words.
+    Returns: { pred_index: [word_indices...] }
+    """
+    page_align: Dict[int, List[int]] = {}
+    if not words or not pis:
+        return page_align
+
+    wbboxes = [w["bbox"] for w in words]
+    wboxes = as_boxes(wbboxes)
+    # Grid pruning is exact only when a match needs overlap; with iou_thresh <= 0 every
+    # word matches (iou >= 0 always holds), so all words stay candidates
+    grid = build_grid(wbboxes) if iou_thresh > 0 else None
+    all_words = np.arange(len(words), dtype=np.intp)
+
+    for pi in pis:
+        ubox = union_box(preds[pi]["boxes"])
+
+        if grid is None or not is_finite_box(ubox):
+            cand = all_words
+        else:
+            # Only words sharing a grid cell with the union box can be center-inside or overlap it
+            # (plus the non-finite words, which the grid cannot place)
+            cols, rows = grid_span(ubox)
+            cand = set(grid.get(None, ()))
+            for gx in cols:
+                for gy in rows:
+                    cand.update(grid.get((gx, gy), ()))
+            if not cand:
+                continue
+            cand = np.fromiter(sorted(cand), dtype=np.intp, count=len(cand))
+
+        # match policy: center-inside OR IoU >= threshold, evaluated for all candidates at once
+        cboxes = wboxes[cand]
+        ubox_arr = as_boxes(ubox)
+        hits = center_inside_matrix(cboxes, ubox_arr) | (iou_matrix(cboxes, ubox_arr) >= iou_thresh)
+        matches = cand[hits[:, 0]].tolist()
+        if matches:
+            page_align[pi] = matches
+
+    return page_align
+
 def align_predictions_to_words(
     pages_words: Dict[int, List[Dict[str, Any]]],
     preds: List[Dict[str, Any]],
@@ -180,57 +468,81 @@ def align_predictions_to_words(
     For each page, for each prediction, find matching Textract words.
     Returns: page -> { pred_index: [word_indices...] }
     """
-    aligned: Dict[int, Dict[int, List[int]]] = {}
-    for p_i, page in enumerate(sorted(pages_words.keys())):
-        aligned.setdefault(page, {})
-
-    for pi, pred in enumerate(preds):
-        page = int(pred["page"] or 1)
-        words = pages_words.get(page, [])
-        if not words:
-            continue
-
-        if pred["boxes"]:
-            ubox = union_box(pred["boxes"])
-            matches = []
-            for wi, w in enumerate(words):
-                wb = w["bbox"]
-                # match policy: center-inside OR IoU >= threshold
-                if center_inside(wb, ubox) or iou(wb, ubox) >= iou_thresh:
-                    matches.append(wi)
-            if matches:
-                aligned.setdefault(page, {})[pi] = matches
-        else:
-            # No coords — cannot spatially align; skip (or handle task-level)
-            pass
-
+    aligned: Dict[int, Dict[int, List[int]]] = {page: {} for page in sorted(pages_words.keys())}
+    for page, pis in group_predictions_by_page(pages_words, preds).items():
+        aligned[page] = align_page(pages_words[page], preds, pis, iou_thresh)
     return aligned
 
 # ----------------------------
 # LS task building
 # ----------------------------
 
+# Result item templates: constant fields are filled once, each region copies and sets
+# "id"/"value" (and "score"). Key order matches the emitted JSON.
+_RECT_TMPL = {
+    "id": None,
+    "type": "rectanglelabels",
+    "value": None,
+    "to_name": "document",
+    "from_name": "word_boxes",
+    "score": None,
+    "origin": "manual",  # still shows as prediction; LS treats as suggestion
+}
+_OCR_TMPL = {
+    "id": None,
+    "type": "textarea",
+    "value": None,
+    "to_name": "document",
+    "from_name": "ocr",
+    "readonly": True
+}
+_FIELD_TMPL = {
+    "id": None,
+    "type": "choices",
+    "value": None,
+    "to_name": "document",
+    "from_name": "field",
+    "score": None
+}
+_VALUE_TMPL = {
+    "id": None,
+    "type": "textarea",
+    "value": None,
+    "to_name": "document",
+    "from_name": "value",
+    "score": None
+}
+
 def make_ls_tasks(
     pages_words: Dict[int, List[Dict[str, Any]]],
     preds: List[Dict[str, Any]],
-    image_source: str
+    image_source: str,
+    iou_thresh: float = 0.2,
+    workers: int = 1
 ) -> List[Dict[str, Any]]:
     """
-    Builds one LS task per page.
-    Controls used in LS config (must match names):
-      - Image name="document"
-      - RectangleLabels name="word_boxes" (token rectangles)
-      - Choices name="field" perRegion=true   (semantic label)
-      - TextArea name="value" perRegion=true  (corrected text)
-      - (Optional) TextArea name="ocr" perRegion=true (raw OCR word for reference)
+    Builds one LS task per page (see iter_ls_tasks).
     """
-    tasks = []
-    aligned = align_predictions_to_words(pages_words, preds)
+    return list(iter_ls_tasks(pages_words, preds, image_source, iou_thresh, workers))
 
-    # Build a set of known field labels from model keys (for validation / completeness)
-    field_labels = sorted({p["key"] for p in preds if p.get("key")})
+def _map_pages(
+    build: Callable[..., Any],
+    pages_words: Dict[int, List[Dict[str, Any]]],
+    preds: List[Dict[str, Any]],
+    image_source: str,
+    iou_thresh: float,
+    workers: int = 1
+) -> Iterator[Any]:
+    """
+    Runs build(image_path, words, word_region_ids, bboxes_pct, page_align) for every page,
+    in page order. By default (workers=1) pages are built inline. Pages are independent, so
+    workers > 1 runs them on a thread pool; only the NumPy / numba alignment releases the GIL
+    and the rest is Python dict/bytes building, so this helps only for pages with many
+    predictions. At most 2 * workers pages are in flight, which keeps streaming output bounded.
+    """
+    page_preds = group_predictions_by_page(pages_words, preds)
 
-    for page in sorted(pages_words.keys()):
+    def run(page):
         words = pages_words[page]
         # Image path resolution
         if "{page}" in image_source:
@@ -238,67 +550,96 @@ def make_ls_tasks(
         else:
             image_path = image_source
 
-        # Prepare predictions/result arrays
-        result_items: List[Dict[str, Any]] = []
+        page_align = align_page(words, preds, page_preds.get(page, []), iou_thresh)
 
         # Create a stable UUID for each word region
-        word_region_ids: List[str] = [str(uuid.uuid4()) for _ in words]
+        word_region_ids: List[str] = region_ids(len(words))
+
+        bboxes_pct = norms_to_pct([w["bbox"] for w in words])
+
+        return build(image_path, words, word_region_ids, bboxes_pct, page_align)
+
+    pages = sorted(pages_words.keys())
+    if workers <= 1 or len(pages) < 2:
+        for page in pages:
+            yield run(page)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for page in pages:
+            pending.append(ex.submit(run, page))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_ls_tasks(
+    pages_words: Dict[int, List[Dict[str, Any]]],
+    preds: List[Dict[str, Any]],
+    image_source: str,
+    iou_thresh: float = 0.2,
+    workers: int = 1
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one LS task per page, so callers can write tasks out as they are built.
+    Controls used in LS config (must match names):
+      - Image name="document"
+      - RectangleLabels name="word_boxes" (token rectangles)
+      - Choices name="field" perRegion=true   (semantic label)
+      - TextArea name="value" perRegion=true  (corrected text)
+      - (Optional) TextArea name="ocr" perRegion=true (raw OCR word for reference)
+    """
+    # Build a set of known field labels from model keys (for validation / completeness)
+    field_labels = sorted({p["key"] for p in preds if p.get("key")})
+
+    def build(image_path, words, word_region_ids, bboxes_pct, page_align):
+        # Prepare predictions/result arrays
+        result_items: List[Dict[str, Any]] = []
 
         # 1) Emit one rectangle per WORD (label="_token"), plus per-region OCR text
         for wi, w in enumerate(words):
             rid = word_region_ids[wi]
-            bbox_pct = norm_to_pct(w["bbox"])
-
-            rect = {
-                "id": rid,
-                "type": "rectanglelabels",
-                "value": {**bbox_pct, "rectanglelabels": ["_token"]},
-                "to_name": "document",
-                "from_name": "word_boxes",
-                "score": None,
-                "origin": "manual",  # still shows as prediction; LS treats as suggestion
+            x, y, width, height = bboxes_pct[wi]
+
+            rect = _RECT_TMPL.copy()
+            rect["id"] = rid
+            rect["value"] = {
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+                "rotation": 0,
+                "rectanglelabels": ["_token"]
             }
             result_items.append(rect)
 
             # Attach raw OCR text for reference (locked by default; annotators edit "value" instead)
-            ocr_text = {
-                "id": rid,
-                "type": "textarea",
-                "value": {"text": [w.get("text", "")]},
-                "to_name": "document",
-                "from_name": "ocr",
-                "readonly": True
-            }
+            ocr_text = _OCR_TMPL.copy()
+            ocr_text["id"] = rid
+            ocr_text["value"] = {"text": [w.get("text", "")]}
             result_items.append(ocr_text)
 
         # 2) Pre-fill model predictions onto matched words
-        page_align = aligned.get(page, {})
         for pi, word_idxs in page_align.items():
             pred = preds[pi]
+            score = pred.get("score")
             # (Annotators can prune/merge by selecting only the intended tokens)
             for wi in word_idxs:
                 rid = word_region_ids[wi]
 
                 # Per-region semantic label (Choices)
-                field_choice = {
-                    "id": rid,
-                    "type": "choices",
-                    "value": {"choices": [pred["key"]]},
-                    "to_name": "document",
-                    "from_name": "field",
-                    "score": pred.get("score")
-                }
+                field_choice = _FIELD_TMPL.copy()
+                field_choice["id"] = rid
+                field_choice["value"] = {"choices": [pred["key"]]}
+                field_choice["score"] = score
                 result_items.append(field_choice)
 
                 # Per-region value textarea (prefill model text for quick correction)
-                val_text = {
-                    "id": rid,
-                    "type": "textarea",
-                    "value": {"text": [pred.get("value", "")]},
-                    "to_name": "document",
-                    "from_name": "value",
-                    "score": pred.get("score")
-                }
+                val_text = _VALUE_TMPL.copy()
+                val_text["id"] = rid
+                val_text["value"] = {"text": [pred.get("value", "")]}
+                val_text["score"] = score
                 result_items.append(val_text)
 
         task = {
@@ -314,9 +655,65 @@ def make_ls_tasks(
                 }
             ]
         }
-        tasks.append(task)
+        return task
+
+    return _map_pages(build, pages_words, preds, image_source, iou_thresh, workers)
+
+# Pre-serialized result items for iter_ls_task_json(): the constant scaffolding is encoded
+# once, only id / coordinates / text are formatted in per region. This restates the task
+# schema by hand: iter_ls_tasks()/make_ls_tasks() and the _*_TMPL dicts are the reference
+# implementation, and tests/test_convert_to_ls.py::test_task_json_matches_task_dicts checks
+# these byte templates against them, so change both together.
+_RECT_JSON = (b'{"id":"%s","type":"rectanglelabels","value":{"x":%r,"y":%r,"width":%r,"height":%r,'
+              b'"rotation":0,"rectanglelabels":["_token"]},"to_name":"document","from_name":"word_boxes",'
+              b'"score":null,"origin":"manual"}')
+_OCR_JSON = (b'{"id":"%s","type":"textarea","value":{"text":[%s]},"to_name":"document",'
+             b'"from_name":"ocr","readonly":true}')
+_FIELD_JSON = (b'{"id":"%s","type":"choices","value":{"choices":[%s]},"to_name":"document",'
+               b'"from_name":"field","score":%s}')
+_VALUE_JSON = (b'{"id":"%s","type":"textarea","value":{"text":[%s]},"to_name":"document",'
+               b'"from_name":"value","score":%s}')
+
+def iter_ls_task_json(
+    pages_words: Dict[int, List[Dict[str, Any]]],
+    preds: List[Dict[str, Any]],
+    image_source: str,
+    iou_thresh: float = 0.2,
+    workers: int = 1
+) -> Iterator[bytes]:
+    """
+    Same tasks as iter_ls_tasks(), yielded as ready-to-write compact JSON bytes.
+    Result items are formatted from byte templates instead of being built as dicts
+    and encoded key by key; iter_ls_tasks() stays the reference for the task schema.
+    """
+    field_labels = sorted({p["key"] for p in preds if p.get("key")})
+
+    def build(image_path, words, word_region_ids, bboxes_pct, page_align):
+        rids = [rid.encode("ascii") for rid in word_region_ids]
+        parts: List[bytes] = []
+
+        for wi, w in enumerate(words):
+            rid = rids[wi]
+            x, y, width, height = bboxes_pct[wi]
+            parts.append(_RECT_JSON % (rid, x, y, width, height))
+            parts.append(_OCR_JSON % (rid, dumps_compact(w.get("text", ""))))
+
+        for pi, word_idxs in page_align.items():
+            pred = preds[pi]
+            # Encoded once per prediction, reused for every matched word
+            key = dumps_compact(pred["key"])
+            value = dumps_compact(pred.get("value", ""))
+            score = dumps_compact(pred.get("score"))
+            for wi in word_idxs:
+                rid = rids[wi]
+                parts.append(_FIELD_JSON % (rid, key, score))
+                parts.append(_VALUE_JSON % (rid, value, score))
+
+        data = dumps_compact({"image": image_path, "field_labels": field_labels})
+        return (b'{"data":' + data + b',"predictions":[{"model_version":"v1","result":['
+                + b",".join(parts) + b']}]}')
 
-    return tasks
+    return _map_pages(build, pages_words, preds, image_source, iou_thresh, workers)
 
 # ---------------------------
 # CLI
@@ -330,21 +727,19 @@ def main():
                     help="Single image path or a template with {page}, e.g. '/images/doc_page_{page}.png'")
     ap.add_argument("--out", type=Path, default=Path("ls_tasks.json"))
     ap.add_argument("--iou", type=float, default=0.20, help="IoU threshold for aligning predictions to words")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Threads used to build pages (default 1: inline)")
     args = ap.parse_args()
 
-    with open(args.textract_json, "r") as f:
-        textract = json.load(f)
-    with open(args.model_json, "r") as f:
-        model = json.load(f)
+    model = load_json(args.model_json)
 
-    pages_words = extract_words_from_textract(textract)
+    pages_words = load_textract_words(args.textract_json)
     preds = extract_predictions(model)
 
-    tasks = make_ls_tasks(pages_words, preds, args.image)
+    tasks = iter_ls_task_json(pages_words, preds, args.image, args.iou, args.workers)
 
-    with open(args.out, "w") as f:
-        json.dump(tasks, f, indent=2)
-    print(f"Wrote {len(tasks)} LS task(s) to {args.out}")
+    count = dump_json_stream(tasks, args.out)
+    print(f"Wrote {count} LS task(s) to {args.out}")
 
 if __name__ == "__main__":
     main()
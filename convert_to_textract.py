@@ -4,10 +4,10 @@ Convert Label Studio export JSON back into our model training schema (textract s
 
 """
 
-import json
 import argparse
 from pathlib import Path
-from collections import defaultdict
+
+from json_io import load_json, dump_json
 
 def pct_to_norm(rect):
     """Convert LS percent coords [0..100] back to normalized [0..1]."""
@@ -22,7 +22,12 @@ def extract_annotations(ls_export):
     """
     Convert LS tasks → training schema.
     """
-    results = []
+    # Accumulate output columns; item dicts are only built once at the end
+    keys, values, pages, boxes_col = [], [], [], []
+    # (x, y, width, height) -> normalized box, shared across the whole export: identical
+    # rectangles (e.g. the same region from several annotators) are converted once and the
+    # emitted items share that dict, so it must not be modified afterwards
+    box_cache = {}
 
     for task in ls_export:
         page = 1  # default, can extend by parsing filename if multipage
@@ -31,40 +36,49 @@ def extract_annotations(ls_export):
             continue
 
         for anno in annos:
-            # Group results by region id
-            region_map = defaultdict(dict)
+            # Classify results per region id in one pass: rid -> [choice, value, boxes]
+            regions = {}
             for r in anno.get("result", []):
                 rid = r.get("id")
                 if not rid:
                     continue
-                region_map[rid].setdefault("raw", []).append(r)
-
-            for rid, bundle in region_map.items():
-                choice = None
-                value = None
-                boxes = []
-
-                for r in bundle["raw"]:
-                    if r["type"] == "choices" and r["from_name"] == "field":
-                        choice = r["value"]["choices"][0]
-                    elif r["type"] == "textarea" and r["from_name"] == "value":
-                        if r["value"].get("text"):
-                            value = r["value"]["text"][0]
-                    elif r["type"] == "rectanglelabels":
-                        boxes.append(pct_to_norm(r["value"]))
-
+                ent = regions.get(rid)
+                if ent is None:
+                    ent = regions[rid] = [None, None, []]
+                t = r["type"]
+                if t == "choices" and r["from_name"] == "field":
+                    ent[0] = r["value"]["choices"][0]
+                elif t == "textarea" and r["from_name"] == "value":
+                    text = r["value"].get("text")
+                    if text:
+                        ent[1] = text[0]
+                elif t == "rectanglelabels":
+                    rect = r["value"]
+                    rkey = (rect["x"], rect["y"], rect["width"], rect["height"])
+                    box = box_cache.get(rkey)
+                    if box is None:
+                        box = box_cache[rkey] = pct_to_norm(rect)
+                    ent[2].append(box)
+
+            for choice, value, boxes in regions.values():
                 if choice and value and boxes:
-                    results.append({
-                        "key": choice,
-                        "value": value,
-                        "page": page,
-                        "valueCoordinates": boxes,
-                        "valueConfidence": 100.0,
-                        "keyConfidence": 100,
-                        "keyCoordinates": []
-                    })
-
-    return results
+                    keys.append(choice)
+                    values.append(value)
+                    pages.append(page)
+                    boxes_col.append(boxes)
+
+    return [
+        {
+            "key": k,
+            "value": v,
+            "page": p,
+            "valueCoordinates": b,
+            "valueConfidence": 100.0,
+            "keyConfidence": 100,
+            "keyCoordinates": []
+        }
+        for k, v, p, b in zip(keys, values, pages, boxes_col)
+    ]
 
 def main():
     ap = argparse.ArgumentParser()
@@ -72,13 +86,11 @@ def main():
     ap.add_argument("--out", type=Path, default=Path("retrain.json"))
     args = ap.parse_args()
 
-    with open(args.ls_export, "r") as f:
-        ls_export = json.load(f)
+    ls_export = load_json(args.ls_export)
 
     retrain_data = extract_annotations(ls_export)
 
-    with open(args.out, "w") as f:
-        json.dump(retrain_data, f, indent=2)
+    dump_json(retrain_data, args.out)
 
     print(f"Wrote {len(retrain_data)} items to {args.out}")
 
@@ -0,0 +1,57 @@
+# json_io.py
+"""
+JSON read/write helpers shared by convert_to_ls.py and convert_to_textract.py.
+
+Uses orjson (SIMD parser/encoder working on raw bytes) when it is installed,
+the stdlib json module otherwise. Output layout is the same either way.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson  # optional
+except ImportError:
+    orjson = None
+
+def load_json(path):
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, "r") as f:
+        return json.load(f)
+
+def dump_json(obj, path):
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2)
+
+def dumps_compact(obj) -> bytes:
+    """Compact encoding of a single value, e.g. to splice user text into a byte template."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def dump_json_stream(items: Iterable[Any], path) -> int:
+    """
+    Writes items as one JSON array, encoding them one at a time so the whole
+    list never has to exist in memory. Layout matches dump_json(); items that are
+    already bytes are written as-is. Returns the item count.
+    """
+    count = 0
+    with open(path, "wb") as f:
+        for item in items:
+            if isinstance(item, bytes):
+                chunk = item  # already encoded
+            elif orjson is not None:
+                chunk = orjson.dumps(item, option=orjson.OPT_INDENT_2)
+            else:
+                chunk = json.dumps(item, indent=2).encode("utf-8")
+            f.write(b",\n  " if count else b"[\n  ")
+            # JSON strings never contain raw newlines, so this only re-indents the layout
+            f.write(chunk.replace(b"\n", b"\n  "))
+            count += 1
+        f.write(b"\n]" if count else b"[]")
+    return count
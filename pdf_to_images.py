@@ -1,53 +1,148 @@
 """
 For PoC only. For production, we will need to make it robust.
 pdf_to_images.py
-to convert a PDF file into page-wise PNG images using PyMuPDF (fitz).
+to convert a PDF file into page-wise PNG (or JPEG) images using PyMuPDF (fitz).
 """
 
-import sys
 import os
+import re
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import fitz  # install PyMuPDF first
 
 
-def pdfToImages(pdf_path: str) -> list:
+def _save_page(page, out_file: str, dpi: int, quality: int) -> None:
+    # Render page to a pixmap  (image) at a fixed DPI, so pixel size does not depend on
+    # the page's physical size; no alpha channel. Format follows the out_file extension.
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    pix.save(out_file, jpg_quality=quality)
+
+
+@lru_cache(maxsize=1)
+def _open_pdf(pdf_path: str, fingerprint: str):
+    """
+    Open the PDF from an in-memory copy, cached per process and keyed by content hash,
+    so repeat calls (and every page a pool worker renders) reuse the parsed document
+    and no file handle is left open on the PDF. Cached documents must not be closed.
+    Memory: the last opened document and its full PDF bytes stay alive for the life of
+    the process (one per pool worker), until a different PDF replaces it.
+    """
+    with open(pdf_path, "rb") as f:
+        return fitz.open(stream=f.read(), filetype="pdf")
+
+
+def _render_page(job: tuple) -> str:
+    """
+    Worker: render one page and save it. Each process opens its own
+    fitz.Document, MuPDF handles must not be shared across processes.
     """
-    Convert a PDF into PNG images and save them alongside the PDF.
+    pdf_path, fingerprint, page_num, out_file, dpi, quality = job
+    doc = _open_pdf(pdf_path, fingerprint)
+    _save_page(doc[page_num], out_file, dpi, quality)
+    return out_file
+
+
+def _fingerprint(path: str) -> str:
+    """Content hash of a file (the PDF, or a rendered image listed in a marker)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pdfToImages(pdf_path: str, workers: int = None, use_cache: bool = True,
+                fmt: str = "png", quality: int = 85, dpi: int = 150) -> list:
+    """
+    Convert a PDF into PNG images (or JPEG, for photographic scans) and save them alongside the PDF.
+    Pages are rendered in parallel, one process per CPU by default.
+    If the same PDF content was already rendered and its images are still there,
+    the existing files are returned without rendering again.
     Args:pdf_path (str): Path to input PDF file.
+         workers (int): Number of render processes (1 renders in-process).
+         use_cache (bool): Set False to always re-render.
+         fmt (str): "jpg" or "png".
+         quality (int): JPEG quality (ignored for PNG).
+         dpi (int): Render resolution.
     Returns:list: List of image file paths created.
     """
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+    if fmt not in ("jpg", "png"):
+        raise ValueError(f"Unsupported image format: {fmt}")
 
     pdf_dir = os.path.dirname(pdf_path)
     pdf_name = os.path.splitext(os.path.basename(pdf_path))[0]
 
-    output_files = []
+    # Marker file lists the images rendered from this exact PDF content with these settings,
+    # each with its own content hash: image names are fixed ({pdf_name}_{n}.{fmt}) and get
+    # overwritten by any later render, so the listed files are only reused if still unchanged.
+    fingerprint = _fingerprint(pdf_path)
+    marker_name = f".{pdf_name}.{fingerprint}.{fmt}-q{quality}-{dpi}dpi.done"
+    marker = os.path.join(pdf_dir, marker_name)
+    if use_cache and os.path.exists(marker):
+        with open(marker, "r") as f:
+            cached = [line.split("\t") for line in f.read().splitlines()]
+        if cached and all(
+            len(entry) == 2 and os.path.exists(entry[0]) and _fingerprint(entry[0]) == entry[1]
+            for entry in cached
+        ):
+            return [path for path, _ in cached]
+
+    # This render replaces the images any older marker of this PDF name points to
+    stale = re.compile(re.escape(f".{pdf_name}.") + r"[0-9a-f]{32}\.[^.]+\.done")
+    for name in os.listdir(pdf_dir or "."):
+        if stale.fullmatch(name):
+            os.remove(os.path.join(pdf_dir, name))
 
-    # Open the PDF
-    doc = fitz.open(pdf_path)
+    def out_file(page_num: int) -> str:
+        return os.path.join(pdf_dir, f"{pdf_name}_{page_num + 1}.{fmt}")
 
-    for page_num in range(len(doc)):
-        page = doc[page_num]
+    def render_inline(doc) -> list:
+        files = []
+        for page_num, page in enumerate(doc.pages()):
+            _save_page(page, out_file(page_num), dpi, quality)
+            files.append(out_file(page_num))
+        return files
 
-        # Render page to a pixmap  (image)
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2)) 
+    if workers == 1:
+        # The cached document also gives the page count: one parse, reused by later calls
+        output_files = render_inline(_open_pdf(pdf_path, fingerprint))
+    else:
+        # Page count from a short-lived handle: the parent must not hold a cached document
+        # when the pool forks, or workers would inherit and share it instead of opening their own
+        with fitz.open(pdf_path) as probe:
+            page_count = len(probe)
+            if page_count < 2:
+                output_files = render_inline(probe)
 
-        out_file = os.path.join(pdf_dir, f"{pdf_name}_{page_num + 1}.png")
-        pix.save(out_file)
-        output_files.append(out_file)
+        if page_count >= 2:
+            # Same reason: drop any document an earlier inline call cached before forking
+            _open_pdf.cache_clear()
+            jobs = [(pdf_path, fingerprint, page_num, out_file(page_num), dpi, quality)
+                    for page_num in range(page_count)]
+            # No more processes than pages: with fork, every worker starts at the first submit
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, page_count)) as ex:
+                output_files = list(ex.map(_render_page, jobs))
 
-    doc.close()
+    with open(marker, "w") as f:
+        f.write("\n".join(f"{path}\t{_fingerprint(path)}" for path in output_files))
     return output_files
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python pdf_to_images.py <pdf_file>")
-        sys.exit(1)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pdf_file", help="PDF to convert")
+    ap.add_argument("--format", dest="fmt", choices=("png", "jpg"), default="png",
+                    help="Image format; png suits text forms / line art, jpg photographic scans")
+    ap.add_argument("--quality", type=int, default=85, help="JPEG quality")
+    ap.add_argument("--dpi", type=int, default=150, help="Render resolution")
+    args = ap.parse_args()
 
-    pdf_file = sys.argv[1]
     try:
-        images = pdfToImages(pdf_file)
+        images = pdfToImages(args.pdf_file, fmt=args.fmt, quality=args.quality, dpi=args.dpi)
         print("Success. Created image files:")
         for img in images:
             print(img)
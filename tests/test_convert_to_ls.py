@@ -0,0 +1,191 @@
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import convert_to_ls as c
+
+SAMPLE = Path(__file__).resolve().parent.parent / "sample_data"
+
+
+def scalar_align(pages_words, preds, iou_thresh):
+    """The original per-pair loop, built on the scalar iou()/center_inside() helpers."""
+    aligned = {page: {} for page in sorted(pages_words)}
+    for pi, pred in enumerate(preds):
+        page = int(pred["page"] or 1)
+        words = pages_words.get(page, [])
+        if not words or not pred["boxes"]:
+            continue
+        ubox = c.union_box(pred["boxes"])
+        matches = [wi for wi, w in enumerate(words)
+                   if c.center_inside(w["bbox"], ubox) or c.iou(w["bbox"], ubox) >= iou_thresh]
+        if matches:
+            aligned[page][pi] = matches
+    return aligned
+
+
+def random_doc(rng):
+    def box(max_w, max_h):
+        return (rng.uniform(-0.2, 1.1), rng.uniform(-0.2, 1.1),
+                rng.choice([0.0, rng.random() * max_w]), rng.random() * max_h)
+
+    pages_words = {}
+    for page in (1, 2, 3):
+        words = [{"text": "w", "bbox": box(0.3, 0.1), "page": page} for _ in range(rng.randint(0, 150))]
+        # tiled boxes that only touch their neighbours' edges
+        words += [{"text": "t", "bbox": (0.1 * i, 0.1 * i, 0.1, 0.1), "page": page} for i in range(10)]
+        pages_words[page] = words
+    preds = []
+    for _ in range(rng.randint(1, 40)):
+        boxes = [box(0.4, 0.3) for _ in range(rng.randint(0, 3))]
+        preds.append({"key": "k", "value": "v", "page": rng.choice([1, 2, 3, 4, None]),
+                      "boxes": boxes, "score": None})
+    preds += [{"key": "e", "value": "v", "page": 1, "boxes": [(0.1 * i, 0.1 * i + 0.1, 0.1, 0.1)],
+               "score": None} for i in range(10)]
+    return pages_words, preds
+
+
+@pytest.mark.parametrize("iou_thresh", [-0.5, 0.0, 0.2, 0.5, 1.0])
+def test_align_matches_scalar_loop(iou_thresh):
+    rng = random.Random(1234)
+    for _ in range(60):
+        pages_words, preds = random_doc(rng)
+        assert (c.align_predictions_to_words(pages_words, preds, iou_thresh)
+                == scalar_align(pages_words, preds, iou_thresh))
+
+
+@pytest.mark.parametrize("iou_thresh", [-0.5, 0.0, 0.2, 1.0])
+def test_align_handles_non_finite_boxes(iou_thresh):
+    nan, inf = float("nan"), float("inf")
+    odd = [(nan, 0.1, 0.1, 0.1), (0.1, 0.1, inf, 0.05), (-inf, 0.1, inf, 0.1),
+           (0.1, 0.1, 0.1, nan), (1e308, 0.1, 1e308, 0.1), (0.1, 0.1, 0.1, 0.1), (0.12, 0.12, 0.05, 0.05)]
+    pages_words = {1: [{"text": "w", "bbox": bbox, "page": 1} for bbox in odd]}
+    preds = [{"key": "k", "value": "v", "page": 1, "boxes": [bbox], "score": None} for bbox in odd]
+    preds.append({"key": "k", "value": "v", "page": 1, "boxes": [(0.1, 0.1, 0.1, 0.1), (nan, 0.2, 0.1, 0.1)],
+                  "score": None})
+    with np.errstate(all="ignore"):
+        aligned = c.align_predictions_to_words(pages_words, preds, iou_thresh)
+    assert aligned == scalar_align(pages_words, preds, iou_thresh)
+
+
+@pytest.mark.parametrize("iou_thresh", [0.0, 0.2])
+def test_align_matches_scalar_loop_on_sample(iou_thresh):
+    pages_words = c.extract_words_from_textract(json.loads((SAMPLE / "135942130-text.json").read_text()))
+    preds = c.extract_predictions(json.loads((SAMPLE / "135942130-forms-model.json").read_text()))
+    assert (c.align_predictions_to_words(pages_words, preds, iou_thresh)
+            == scalar_align(pages_words, preds, iou_thresh))
+
+
+def test_iou_matrix_matches_scalar_iou(monkeypatch):
+    rng = np.random.default_rng(7)
+    a = rng.random((50, 4)) * 0.5
+    b = rng.random((20, 4)) * 0.5
+    expected = np.array([[c.iou(x, y) for y in b] for x in a])
+    # NumPy path (small matrices never load numba)
+    assert np.array_equal(c.iou_matrix(a, b), expected)
+    # numba kernel, forced for any size
+    if c._numba_iou_kernel() is not None:
+        monkeypatch.setattr(c, "NUMBA_MIN_PAIRS", 0)
+        assert np.array_equal(c.iou_matrix(a, b), expected)
+
+
+def canonical_ids(tasks):
+    """Replace random region ids by their order of first appearance, keeping how items share ids."""
+    tasks = json.loads(json.dumps(tasks))
+    for task in tasks:
+        seen = {}
+        for r in task["predictions"][0]["result"]:
+            r["id"] = seen.setdefault(r["id"], len(seen))
+    return tasks
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_task_json_matches_task_dicts(monkeypatch, use_orjson):
+    import json_io
+    if not use_orjson:
+        monkeypatch.setattr(json_io, "orjson", None)
+    rng = random.Random(99)
+    pages_words, preds = random_doc(rng)
+    pages_words[2][0]["text"] = 'quote " back\\ é\n'
+    preds[0].update(key="kü", value="tab\there", score=0.75)
+
+    expected = canonical_ids(c.make_ls_tasks(pages_words, preds, "img_{page}.png"))
+    got = canonical_ids([json.loads(b) for b in c.iter_ls_task_json(pages_words, preds, "img_{page}.png")])
+    assert got == expected
+    # same keys in the same order, item by item
+    assert json.dumps(got) == json.dumps(expected)
+
+
+def test_threaded_pages_match_inline():
+    rng = random.Random(5)
+    pages_words, preds = random_doc(rng)
+    inline = canonical_ids(c.make_ls_tasks(pages_words, preds, "img_{page}.png"))
+    threaded = canonical_ids(c.make_ls_tasks(pages_words, preds, "img_{page}.png", workers=3))
+    assert threaded == inline
+
+
+def textract_blocks():
+    def word(text, page, left, top=0.1):
+        return {"BlockType": "WORD", "Text": text, "Page": page, "Confidence": 99.1, "Id": text,
+                "Geometry": {"BoundingBox": {"Left": left, "Top": top, "Width": 0.05, "Height": 0.02},
+                             "Polygon": [{"X": left, "Y": top}]}}
+
+    return [
+        {"BlockType": "PAGE", "Page": 1, "Geometry": {"BoundingBox": {"Left": 0.0, "Top": 0.0,
+                                                                      "Width": 1.0, "Height": 1.0}}},
+        {"BlockType": "LINE", "Text": "Name Jane", "Page": 1},
+        word("Name", 1, 0.1), word("Jane", 1, 0.2),
+        {"BlockType": "WORD", "Text": "nobox", "Page": 1},
+        {"BlockType": "WORD", "Text": "nogeom", "Page": 1, "Geometry": {"Polygon": []}},
+        word("Total", 2, 0.5, 0.75),
+    ]
+
+
+def write_json(path, obj):
+    path.write_text(json.dumps(obj))
+    return path
+
+
+@pytest.mark.parametrize("hidden", [(), ("msgspec",), ("msgspec", "ijson")])
+def test_textract_readers_agree(monkeypatch, tmp_path, hidden):
+    for module in hidden:
+        monkeypatch.setattr(c, module, None)
+    blocks = textract_blocks()
+    path = write_json(tmp_path / "text.json", {"DocumentMetadata": {"Pages": 2}, "Blocks": blocks})
+    expected = c.words_from_blocks(blocks)
+    assert sorted(expected) == [1, 2] and len(expected[1]) == 2
+
+    assert c.extract_words_from_textract({"Blocks": blocks}) == expected
+    assert c.load_textract_words(path) == expected
+    if c.ijson is not None:
+        assert c.extract_words_from_textract_stream(path) == expected
+    if c.msgspec is not None:
+        assert c.extract_words_from_textract_typed(path) == expected
+
+
+def test_textract_typed_schema_mismatch_falls_back(tmp_path):
+    blocks = textract_blocks()
+    blocks[2]["Text"] = None
+    path = write_json(tmp_path / "text.json", {"Blocks": blocks})
+    if c.msgspec is not None:
+        with pytest.raises(c.msgspec.ValidationError):
+            c.extract_words_from_textract_typed(path)
+    assert c.load_textract_words(path) == c.words_from_blocks(blocks)
+
+
+@pytest.mark.parametrize("hidden", [(), ("msgspec",)])
+def test_textract_without_words(monkeypatch, tmp_path, hidden):
+    for module in hidden:
+        monkeypatch.setattr(c, module, None)
+    blocks = [b for b in textract_blocks() if b["BlockType"] != "WORD"]
+    assert c.load_textract_words(write_json(tmp_path / "text.json", {"Blocks": blocks})) == {}
+    with pytest.raises(ValueError):
+        c.load_textract_words(write_json(tmp_path / "other.json", {"Pages": []}))
+
+
+def test_reduced_textract_list(tmp_path):
+    items = [{"page": 2, "text": "Jane", "bbox": {"left": 0.2, "top": 0.1, "width": 0.05, "height": 0.02}}]
+    assert c.load_textract_words(write_json(tmp_path / "text.json", items)) == {
+        2: [{"text": "Jane", "bbox": (0.2, 0.1, 0.05, 0.02), "page": 2}]}
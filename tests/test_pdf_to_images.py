@@ -0,0 +1,92 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+import pdf_to_images as p
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "sample_data" / "135942130.pdf"
+
+
+def write_other_pdf(path):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "a different document")
+    doc.save(str(path))
+    doc.close()
+
+
+def image_bytes(paths):
+    return [Path(path).read_bytes() for path in paths]
+
+
+def backdate(paths):
+    for path in paths:
+        os.utime(path, ns=(0, 0))
+
+
+def rerendered(paths):
+    """Which of the backdated images were written again since."""
+    return [os.stat(path).st_mtime_ns != 0 for path in paths]
+
+
+def fresh_render(tmp_path, pdf, **kwargs):
+    """Images of `pdf` rendered from scratch in a directory of their own."""
+    ref_dir = tmp_path / "ref"
+    ref_dir.mkdir(exist_ok=True)
+    shutil.copy(pdf, ref_dir / "doc.pdf")
+    return image_bytes(p.pdfToImages(str(ref_dir / "doc.pdf"), workers=1, use_cache=False, **kwargs))
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    path = tmp_path / "doc.pdf"
+    shutil.copy(SAMPLE_PDF, path)
+    return path
+
+
+def test_second_call_reuses_images(pdf):
+    images = p.pdfToImages(str(pdf), workers=1)
+    backdate(images)
+    assert p.pdfToImages(str(pdf), workers=1) == images
+    assert not any(rerendered(images))
+
+
+def test_replaced_pdf_is_not_served_stale_images(tmp_path, pdf):
+    expected_a = fresh_render(tmp_path, SAMPLE_PDF)
+
+    p.pdfToImages(str(pdf), workers=1)
+    write_other_pdf(pdf)
+    assert len(p.pdfToImages(str(pdf), workers=1)) == 1
+    shutil.copy(SAMPLE_PDF, pdf)
+    # B overwrote doc_1.png, so A must be rendered again
+    images_a = p.pdfToImages(str(pdf), workers=1)
+    assert image_bytes(images_a) == expected_a
+
+
+def test_dpi_change_rerenders(tmp_path, pdf):
+    expected = fresh_render(tmp_path, SAMPLE_PDF, dpi=150)
+
+    p.pdfToImages(str(pdf), workers=1, dpi=150)
+    low = p.pdfToImages(str(pdf), workers=1, dpi=72)
+    assert image_bytes(low) != expected
+    high = p.pdfToImages(str(pdf), workers=1, dpi=150)
+    assert image_bytes(high) == expected
+
+
+def test_edited_image_is_rerendered(pdf):
+    images = p.pdfToImages(str(pdf), workers=1)
+    expected = image_bytes(images)
+    Path(images[0]).write_bytes(b"not the rendered page")
+
+    assert p.pdfToImages(str(pdf), workers=1) == images
+    assert image_bytes(images) == expected
+
+
+def test_use_cache_false_always_renders(pdf):
+    images = p.pdfToImages(str(pdf), workers=1)
+    backdate(images)
+    assert p.pdfToImages(str(pdf), workers=1, use_cache=False) == images
+    assert all(rerendered(images))